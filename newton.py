@@ -14,22 +14,34 @@ A small PyQt5 tray app to control multiple Elgato Key Lights by static IPs.
 
 Dependencies (Arch/EndeavourOS):
   sudo pacman -S python-requests python-pyqt5
+Optional (faster JSON handling):
+  sudo pacman -S python-orjson
 Run:
   python keylight_tray.py
 
 Customize the IPs by editing the STATIC_IPS list below.
 """
 
+import itertools
+import json
 import sys
 import threading
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
 from pathlib import Path
 
 import requests
 from PyQt5 import QtCore, QtGui, QtWidgets
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json works just as well
+    orjson = None
+
 # ---------------------- User configuration ----------------------
 # Put your known lamp IPs here. You can add/remove IPs anytime.
 STATIC_IPS = [
@@ -41,6 +53,60 @@ HTTP_TIMEOUT = 1.2
 # ---------------------------------------------------------------
 
 API_PATH = "/elgato/lights"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Seconds after the last successful request that the remembered lamp state
+# is trusted to skip unchanged fields. Short on purpose: changes made outside
+# this app (lamp button, Control Center, Stream Deck) are only masked within
+# this window.
+LAST_STATE_TTL = 1.0
+
+# Supported Kelvin range and a precomputed Kelvin -> mired lookup table
+KELVIN_MIN = 2900
+KELVIN_MAX = 7000
+MIRED_LUT = [int(round(1_000_000 / k)) for k in range(KELVIN_MIN, KELVIN_MAX + 1)]
+
+
+def json_loads(data: bytes):
+    """
+    Parse JSON bytes (orjson if available).
+
+    Parameters
+    ----------
+    data : bytes
+        UTF-8 encoded JSON document.
+
+    Returns
+    -------
+    object
+        The decoded JSON value.
+
+    Raises
+    ------
+    ValueError
+        If ``data`` is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    """
+    Serialize an object to compact JSON bytes (orjson if available).
+
+    Parameters
+    ----------
+    obj : object
+        JSON-serializable object.
+
+    Returns
+    -------
+    bytes
+        UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
 
 
 def kelvin_to_mired(k: int) -> int:
@@ -57,8 +123,7 @@ def kelvin_to_mired(k: int) -> int:
     int
         The corresponding mired value.
     """
-    k = max(2900, min(7000, int(k)))
-    return int(round(1_000_000 / k))
+    return MIRED_LUT[max(0, min(KELVIN_MAX - KELVIN_MIN, int(k) - KELVIN_MIN))]
 
 
 def clamp_brightness(b: int) -> int:
@@ -78,10 +143,10 @@ def clamp_brightness(b: int) -> int:
     return max(0, min(100, int(b)))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LightStatus:
     """
-    Data class containing the current state of a Key Light.
+    Immutable data class containing the current state of a Key Light.
 
     Attributes
     ----------
@@ -93,14 +158,11 @@ class LightStatus:
         Current brightness value (0–100).
     mired : int
         Current color temperature in mired.
-    raw : dict
-        Raw JSON data returned by the Key Light API.
     """
     reachable: bool
     on: int = 0
     brightness: int = 0
     mired: int = 0
-    raw: dict = field(default_factory=dict)
 
 
 class KeylightHTTP:
@@ -117,15 +179,23 @@ class KeylightHTTP:
         The IP address of the Key Light.
     base : str
         The full base URL for the Key Light API endpoint.
+    session : requests.Session
+        Persistent session so the TCP connection to the lamp is kept alive
+        and reused across requests.
 
     Methods
     -------
     get() -> LightStatus
         Fetch the current status of the light. Returns a LightStatus object.
     set(on: Optional[int] = None, brightness: Optional[int] = None,
-        mired: Optional[int] = None) -> bool
-        Update the light's state. Only the provided parameters are changed.
-        Returns True if the request succeeded, otherwise False.
+        mired: Optional[int] = None, still_wanted=None) -> bool
+        Update the light's state. Only parameters that differ from the last
+        known state are sent; that state is forgotten ``LAST_STATE_TTL``
+        seconds after the last successful request. If nothing changed, no
+        request is made.
+        Returns True if the request succeeded (or was skipped), otherwise False.
+    close() -> None
+        Close the underlying HTTP session.
     """
 
     def __init__(self, host: str):
@@ -139,6 +209,15 @@ class KeylightHTTP:
         """
         self.host = host
         self.base = f"http://{host}:9123{API_PATH}"
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        # Last known lamp state (None = unknown) and the time.monotonic() of
+        # the last successful request; both guarded by _lock
+        self._last = {"on": None, "brightness": None, "temperature": None}
+        self._last_time = 0.0
+        self._lock = threading.Lock()
 
     def get(self) -> LightStatus:
         """
@@ -149,28 +228,43 @@ class KeylightHTTP:
         LightStatus
             Current state of the Key Light.
         """
-        try:
-            r = requests.get(self.base, timeout=HTTP_TIMEOUT)
-            r.raise_for_status()
-            data = r.json()
-            lights = data.get("lights", [])
-            if not lights:
-                return LightStatus(reachable=True, raw=data)
-            l0 = lights[0]
-            return LightStatus(
-                reachable=True,
-                on=int(l0.get("on", 0)),
-                brightness=int(l0.get("brightness", 0)),
-                mired=int(l0.get("temperature", 0)),
-                raw=data,
-            )
-        except RequestException:
-            return LightStatus(reachable=False)
+        # Held across the GET so a concurrent PUT cannot be overwritten
+        # in _last by a response that predates it
+        with self._lock:
+            try:
+                r = self.session.get(self.base, timeout=HTTP_TIMEOUT)
+                r.raise_for_status()
+                data = json_loads(r.content)
+                lights = data.get("lights", [])
+                if not lights:
+                    return LightStatus(reachable=True)
+                l0 = lights[0]
+                st = LightStatus(
+                    reachable=True,
+                    on=int(l0.get("on", 0)),
+                    brightness=int(l0.get("brightness", 0)),
+                    mired=int(l0.get("temperature", 0)),
+                )
+                self._last = {"on": st.on, "brightness": st.brightness,
+                              "temperature": st.mired}
+                self._last_time = time.monotonic()
+                return st
+            except (RequestException, ValueError, TypeError, AttributeError):
+                # Network errors and malformed JSON bodies alike
+                self._last = dict.fromkeys(self._last)
+                return LightStatus(reachable=False)
 
     def set(self, on: Optional[int] = None,
-            brightness: Optional[int] = None, mired: Optional[int] = None) -> bool:
+            brightness: Optional[int] = None, mired: Optional[int] = None,
+            still_wanted: Optional[Callable[[], bool]] = None) -> bool:
         """
-        Update the Key Light state. Only provided parameters are updated.
+        Update the Key Light state. Only provided parameters that differ
+        from the last known state are sent.
+
+        The last known state is forgotten ``LAST_STATE_TTL`` seconds after
+        the last successful request, so a change made on the lamp outside
+        this app can only cause a field to be skipped while the user is
+        actively changing settings.
 
         Parameters
         ----------
@@ -180,25 +274,47 @@ class KeylightHTTP:
             Brightness (0–100).
         mired : int, optional
             Color temperature in mired.
+        still_wanted : callable, optional
+            Checked right before sending, while holding the per-lamp lock;
+            if it returns False the update is dropped as stale.
 
         Returns
         -------
         bool
-            True if the request succeeded, False otherwise.
+            True if the request succeeded or nothing had to be sent,
+            False otherwise.
         """
-        payload = {"numberOfLights": 1, "lights": [{}]}
+        wanted = {}
         if on is not None:
-            payload["lights"][0]["on"] = 1 if on else 0
+            wanted["on"] = 1 if on else 0
         if brightness is not None:
-            payload["lights"][0]["brightness"] = clamp_brightness(brightness)
+            wanted["brightness"] = clamp_brightness(brightness)
         if mired is not None:
-            payload["lights"][0]["temperature"] = int(mired)
-        try:
-            r = requests.put(self.base, json=payload, timeout=HTTP_TIMEOUT)
-            r.raise_for_status()
+            wanted["temperature"] = int(mired)
+        with self._lock:
+            if still_wanted is not None and not still_wanted():
+                return True
+            if time.monotonic() - self._last_time > LAST_STATE_TTL:
+                self._last = dict.fromkeys(self._last)
+            light = {key: val for key, val in wanted.items() if self._last[key] != val}
+            if not light:
+                return True
+            body = json_dumps({"numberOfLights": 1, "lights": [light]})
+            try:
+                r = self.session.put(self.base, data=body, headers=JSON_HEADERS,
+                                     timeout=HTTP_TIMEOUT)
+                r.raise_for_status()
+            except RequestException:
+                # The lamp may or may not have applied it; resend next time
+                self._last.update(dict.fromkeys(light))
+                return False
+            self._last.update(light)
+            self._last_time = time.monotonic()
             return True
-        except RequestException:
-            return False
+
+    def close(self):
+        """Close the HTTP session and release pooled connections."""
+        self.session.close()
 
 
 class RoundLED(QtWidgets.QLabel):
@@ -216,9 +332,42 @@ class RoundLED(QtWidgets.QLabel):
     def __init__(self, diameter=14, parent=None):
         super().__init__(parent)
         self._diameter = diameter
-        self._color = QtGui.QColor("red")
+        self._color_name = "red"
+        # Rendered lazily in paintEvent, once the widget knows its screen
+        self._pixmaps: Dict[Tuple[str, float], QtGui.QPixmap] = {}
         self.setFixedSize(diameter, diameter)
 
+    def _render(self, color_name: str, dpr: float) -> QtGui.QPixmap:
+        """
+        Return the LED pixmap for a color and pixel ratio, rendering it on first use.
+
+        Parameters
+        ----------
+        color_name : str
+            Name of the color to display (e.g. "green", "red").
+        dpr : float
+            Device pixel ratio of the screen the widget is shown on.
+
+        Returns
+        -------
+        QPixmap
+            Pre-rendered filled circle in the given color.
+        """
+        pixmap = self._pixmaps.get((color_name, dpr))
+        if pixmap is None:
+            size = int(round(self._diameter * dpr))
+            pixmap = QtGui.QPixmap(size, size)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setBrush(QtGui.QBrush(QtGui.QColor(color_name)))
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.drawEllipse(QtCore.QRectF(1, 1, self._diameter - 2, self._diameter - 2))
+            painter.end()
+            self._pixmaps[(color_name, dpr)] = pixmap
+        return pixmap
+
     def set_color(self, color_name: str):
         """
         Set the LED color.
@@ -228,25 +377,20 @@ class RoundLED(QtWidgets.QLabel):
         color_name : str
             Name of the color to display (e.g. "green", "red").
         """
-        self._color = QtGui.QColor(color_name)
+        self._color_name = color_name
         self.update()
 
     def paintEvent(self, event):
         """
-        Paint the LED as a filled circle in the current color.
+        Paint the cached LED pixmap for the current color.
 
         Parameters
         ----------
         event : QPaintEvent
             Qt paint event.
         """
-        painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        rect = self.rect().adjusted(1, 1, -1, -1)
-        brush = QtGui.QBrush(self._color)
-        painter.setBrush(brush)
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.drawEllipse(rect)
+        pixmap = self._render(self._color_name, self.devicePixelRatioF())
+        QtGui.QPainter(self).drawPixmap(0, 0, pixmap)
 
 
 class ControlWindow(QtWidgets.QWidget):
@@ -294,7 +438,7 @@ class ControlWindow(QtWidgets.QWidget):
         self.lbl_b = QtWidgets.QLabel("Helligkeit: 50%")
 
         self.sld_k = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        self.sld_k.setRange(2900, 7000)
+        self.sld_k.setRange(KELVIN_MIN, KELVIN_MAX)
         self.sld_k.setValue(4000)
         self.lbl_k = QtWidgets.QLabel("Farbtemp: 4000 K")
 
@@ -324,6 +468,12 @@ class ControlWindow(QtWidgets.QWidget):
         self._apply_timer.setSingleShot(True)
         self._apply_timer.timeout.connect(self._emit_apply)
 
+        # Coalesce label updates during slider drags to at most ~60 Hz
+        self._label_timer = QtCore.QTimer(self)
+        self._label_timer.setInterval(16)
+        self._label_timer.setSingleShot(True)
+        self._label_timer.timeout.connect(self._refresh_labels)
+
         self._pending = {"on": None, "b": 50, "k": 4000}
 
     # --- UI callbacks
@@ -349,8 +499,8 @@ class ControlWindow(QtWidgets.QWidget):
         val : int
             New brightness value.
         """
-        self.lbl_b.setText(f"Helligkeit: {val}%")
         self._pending["b"] = val
+        self._schedule_label_refresh()
         self._apply_timer.start()
 
     def _kelvin_changed(self, val: int):
@@ -362,10 +512,20 @@ class ControlWindow(QtWidgets.QWidget):
         val : int
             New Kelvin temperature.
         """
-        self.lbl_k.setText(f"Farbtemp: {val} K")
         self._pending["k"] = val
+        self._schedule_label_refresh()
         self._apply_timer.start()
 
+    def _schedule_label_refresh(self):
+        """Start the label timer unless a refresh is already scheduled."""
+        if not self._label_timer.isActive():
+            self._label_timer.start()
+
+    def _refresh_labels(self):
+        """Update the slider labels from the pending state."""
+        self.lbl_b.setText(f"Helligkeit: {self._pending['b']}%")
+        self.lbl_k.setText(f"Farbtemp: {self._pending['k']} K")
+
     def _emit_apply(self):
         """Emit a request_apply signal with the current pending state."""
         self.request_apply.emit(dict(self._pending))
@@ -395,7 +555,7 @@ class TrayApp(QtWidgets.QSystemTrayIcon):
     Provides:
     - Tray icon with context menu
     - Control window for user interaction
-    - Background threads for probing and applying light states
+    - A worker pool for probing and applying light states
     """
 
     def __init__(self, app: QtWidgets.QApplication):
@@ -424,6 +584,16 @@ class TrayApp(QtWidgets.QSystemTrayIcon):
         # Networking state
         self.controllers = [KeylightHTTP(ip) for ip in STATIC_IPS]
         self.last_probe: Dict[str, LightStatus] = {}
+        # Shared workers so requests to all lamps run concurrently
+        self.pool = ThreadPoolExecutor(max_workers=max(4, len(STATIC_IPS)))
+        # Sequence numbers so stale queued applies can be dropped
+        self._apply_seq = itertools.count(1)
+        self._latest_seq = 0
+        # A probe requested while one runs is queued once, not dropped
+        self._probe_running = False
+        self._probe_again = False
+        self._probe_lock = threading.Lock()
+        self._closing = False
 
         # Initial probe (async)
         QtCore.QTimer.singleShot(100, self.probe_all)
@@ -455,13 +625,48 @@ class TrayApp(QtWidgets.QSystemTrayIcon):
 
     # --- Network ops (threaded)
     def probe_all(self):
-        """Probe all configured IPs in a background thread."""
-        def worker():
+        """
+        Probe all configured IPs concurrently on the worker pool.
+
+        If a probe is already in flight, one follow-up probe is started
+        when it finishes, since the running probe began before this
+        request. Further requests in the meantime share that follow-up.
+        """
+        with self._probe_lock:
+            if self._closing:
+                return
+            if self._probe_running:
+                self._probe_again = True
+                return
+            self._probe_running = True
+        try:
+            futures = [self.pool.submit(ctl.get) for ctl in self.controllers]
+        except RuntimeError:
+            # Pool was shut down between the check above and the submit
+            with self._probe_lock:
+                self._probe_running = False
+            return
+        self._gather(futures, self._probe_done)
+
+    def _probe_done(self, futures):
+        """
+        Store probe results and update the LED in the main thread.
+
+        Parameters
+        ----------
+        futures : list of Future
+            Finished probe futures in the same order as ``self.controllers``.
+            A future that raised counts as an unreachable lamp.
+        """
+        try:
             statuses: Dict[str, LightStatus] = {}
             tooltip_lines = []
             all_ok = True
-            for ctl in self.controllers:
-                st = ctl.get()
+            for ctl, fut in zip(self.controllers, futures):
+                if fut.cancelled() or fut.exception() is not None:
+                    st = LightStatus(reachable=False)
+                else:
+                    st = fut.result()
                 statuses[ctl.host] = st
                 tooltip_lines.append(f"{ctl.host}: {'reachable' if st.reachable else 'unreachable'}")
                 if not st.reachable:
@@ -476,7 +681,45 @@ class TrayApp(QtWidgets.QSystemTrayIcon):
                 QtCore.Q_ARG(bool, all_ok),
                 QtCore.Q_ARG(str, tooltip),
             )
-        threading.Thread(target=worker, daemon=True).start()
+        finally:
+            # Never leave the flag set, or every later probe is dropped
+            with self._probe_lock:
+                self._probe_running = False
+                again, self._probe_again = self._probe_again, False
+            if again:
+                self.probe_all()
+
+    @staticmethod
+    def _gather(futures, callback):
+        """
+        Invoke ``callback`` with the futures once every one has finished.
+
+        The callback runs on whichever pool thread completes last, so no
+        extra thread is needed to wait for the batch.
+
+        Parameters
+        ----------
+        futures : list of Future
+            Futures to wait for.
+        callback : callable
+            Called with ``futures`` once all are done; it is responsible
+            for handling futures that raised.
+        """
+        if not futures:
+            callback(futures)
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_fut):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            callback(futures)
+
+        for fut in futures:
+            fut.add_done_callback(done)
 
     def apply_to_all(self, payload: dict):
         """
@@ -492,10 +735,49 @@ class TrayApp(QtWidgets.QSystemTrayIcon):
         k = payload.get("k")
         mired = kelvin_to_mired(k) if k is not None else None
 
-        def worker():
-            for ctl in self.controllers:
-                ctl.set(on=on, brightness=b, mired=mired)
-        threading.Thread(target=worker, daemon=True).start()
+        seq = next(self._apply_seq)
+        self._latest_seq = seq
+        for ctl in self.controllers:
+            self.pool.submit(self._apply_one, ctl, seq, on, b, mired)
+
+    def _apply_one(self, ctl: KeylightHTTP, seq: int, on: Optional[int],
+                   b: Optional[int], mired: Optional[int]):
+        """
+        Send a state to one lamp unless a newer apply has superseded it.
+
+        Parameters
+        ----------
+        ctl : KeylightHTTP
+            Target lamp.
+        seq : int
+            Sequence number of the apply this request belongs to.
+        on, b, mired : int, optional
+            State to send (see ``KeylightHTTP.set``).
+        """
+        if seq != self._latest_seq:
+            return
+        # Re-checked under the lamp lock, since an earlier PUT may block us
+        ctl.set(on=on, brightness=b, mired=mired,
+                still_wanted=lambda: seq == self._latest_seq)
+
+    def shutdown(self):
+        """
+        Stop the worker pool and release network resources.
+
+        Queued requests are cancelled and apply tasks waiting on a lamp
+        lock give up. Requests already on the wire are waited for so their
+        sessions are not closed underneath them; per lamp that is the
+        in-flight request plus at most one probe waiting behind it, each
+        bounded by ``HTTP_TIMEOUT`` for connecting and again for reading.
+        Lamps are handled in parallel.
+        """
+        with self._probe_lock:
+            self._closing = True
+        # Invalidate every pending apply, including ones blocked on a lock
+        self._latest_seq = next(self._apply_seq)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        for ctl in self.controllers:
+            ctl.close()
 
 def load_app_icon(app: QtWidgets.QApplication) -> QtGui.QIcon:
     """
@@ -534,6 +816,7 @@ def main():
 
     # Explicitly clean up the tray before exit
     tray.hide()
+    tray.shutdown()
     del tray
 
     sys.exit(exit_code)